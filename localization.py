@@ -5,8 +5,11 @@
 переводами текстов на разные языки.
 """
 
+import sys
+import functools
 from enum import Enum
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Mapping, Any
 
 
 class Language(Enum):
@@ -16,7 +19,7 @@ class Language(Enum):
 
 
 # Словари с переводами для каждого языка
-TRANSLATIONS: Dict[Language, Dict[str, Any]] = {
+TRANSLATIONS: Dict[Language, Mapping[str, Any]] = {
     Language.RUSSIAN: {
         # Общие строки
         "welcome_banner": "Добро пожаловать в программу",
@@ -35,6 +38,7 @@ TRANSLATIONS: Dict[Language, Dict[str, Any]] = {
         "name_empty_error": "Имя не может быть пустым. Пожалуйста, введите ваше имя.",
         "invalid_input": "Некорректный ввод. Пожалуйста, попробуйте снова.",
         "hello": "Привет",
+        "default_username": "Пользователь",
         "using_default_name": "Используем имя по умолчанию: {name}",
         "timeout_message": "Время ожидания истекло.",
         
@@ -72,6 +76,7 @@ TRANSLATIONS: Dict[Language, Dict[str, Any]] = {
         "name_empty_error": "Name cannot be empty. Please enter your name.",
         "invalid_input": "Invalid input. Please try again.",
         "hello": "Hello",
+        "default_username": "User",
         "using_default_name": "Using default name: {name}",
         "timeout_message": "Timeout expired.",
         
@@ -92,6 +97,39 @@ TRANSLATIONS: Dict[Language, Dict[str, Any]] = {
     }
 }
 
+# Таблицы переводов только читаются: делаем их неизменяемыми и интернируем ключи
+TRANSLATIONS = {
+    language: MappingProxyType({sys.intern(key): value for key, value in table.items()})
+    for language, table in TRANSLATIONS.items()
+}
+
+# Таблицы переводов по коду языка и запасная таблица (русский язык).
+# Ключи - строковые коды, а не члены Language: их хэш вычисляется быстрее.
+_TABLES: Dict[str, Mapping[str, Any]] = {
+    Language.RUSSIAN.value: TRANSLATIONS[Language.RUSSIAN],
+    Language.ENGLISH.value: TRANSLATIONS[Language.ENGLISH],
+}
+_FALLBACK_TABLE: Mapping[str, Any] = _TABLES[Language.RUSSIAN.value]
+
+
+@functools.lru_cache(maxsize=256)
+def _lookup(code: str, key: str) -> Any:
+    """
+    Ищет перевод по коду языка и ключу с кэшированием результата.
+    Если ключ отсутствует в таблице языка, используется русская таблица.
+    
+    Args:
+        code: Код языка (значение Language)
+        key: Ключ для поиска в словаре переводов
+        
+    Returns:
+        Найденное значение или None, если ключ отсутствует
+    """
+    value = _TABLES.get(code, _FALLBACK_TABLE).get(key)
+    if value is None:
+        value = _FALLBACK_TABLE.get(key)
+    return value
+
 
 class Localizer:
     """Класс для управления локализацией текстов."""
@@ -103,7 +141,7 @@ class Localizer:
         Args:
             language: Язык для использования (по умолчанию русский)
         """
-        self.language = language
+        self.set_language(language)
     
     def get_text(self, key: str) -> str:
         """
@@ -115,8 +153,10 @@ class Localizer:
         Returns:
             Локализованный текст
         """
-        translations = TRANSLATIONS.get(self.language, TRANSLATIONS[Language.RUSSIAN])
-        return translations.get(key, f"[Missing translation: {key}]")
+        value = _lookup(self._code, key)
+        if value is None:
+            return f"[Missing translation: {key}]"
+        return value
     
     def get_list(self, key: str) -> list:
         """
@@ -126,10 +166,12 @@ class Localizer:
             key: Ключ для поиска в словаре переводов
             
         Returns:
-            Локализованный список
+            Локализованный список (общий для всех вызовов, не изменяйте его)
         """
-        translations = TRANSLATIONS.get(self.language, TRANSLATIONS[Language.RUSSIAN])
-        return translations.get(key, [])
+        value = _lookup(self._code, key)
+        if value is None:
+            return []
+        return value
     
     def set_language(self, language: Language) -> None:
         """
@@ -139,6 +181,7 @@ class Localizer:
             language: Новый язык
         """
         self.language = language
+        self._code = language.value
 
 
 # Создаем глобальный экземпляр локализатора
@@ -178,4 +221,6 @@ def set_language(language: Language) -> None:
     Args:
         language: Новый язык
     """
+    if language is localizer.language:
+        return
     localizer.set_language(language)
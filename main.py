@@ -6,12 +6,13 @@
 вычислениями и поддержкой разных языков.
 """
 
+import os
 import sys
 import time
-import threading
-import queue
+import select
+import functools
 from dataclasses import dataclass
-from typing import List, Any, Optional, Callable, Union, TypeVar
+from typing import List, Any, Optional, Callable, Union, Tuple, TextIO, TypeVar
 
 # Сторонние библиотеки
 from colorama import init, Fore, Style
@@ -22,26 +23,59 @@ from localization import Language, get_text, get_list, set_language
 # Инициализация colorama
 init()
 
+# ANSI-последовательности, используемые при форматировании вывода
+_CYAN = Fore.CYAN
+_GREEN = Fore.GREEN
+_WHITE = Fore.WHITE
+_YELLOW = Fore.YELLOW
+_BRIGHT = Style.BRIGHT
+_RESET = Style.RESET_ALL
+
 # Константы для UI
 PROGRESS_STEPS = 50
 DEFAULT_PROGRESS_WIDTH = 20
 ANIMATION_DELAY = 0.2
 DEFAULT_PAUSE = 0.5
 
+# Подписи процентов для каждого шага прогресс-бара
+_PERCENT_LABELS = tuple(f" {i * 100 // PROGRESS_STEPS}%" for i in range(PROGRESS_STEPS + 1))
+
 # Константы для пользователя
 INPUT_TIMEOUT = 10  # секунд
+INPUT_POLL_INTERVAL = 0.02  # секунд, опрос клавиатуры в Windows
 
 def get_default_username() -> str:
     """Возвращает имя пользователя по умолчанию в зависимости от текущего языка."""
-    from localization import localizer
-    if localizer.language == Language.ENGLISH:
-        return "User"
-    else:
-        return "Пользователь"
+    return get_text("default_username")
 
 T = TypeVar('T')
 
 
+@functools.lru_cache(maxsize=16)
+def _progress_frames(progress_text: str, width: int, use_colors: bool) -> Tuple[str, ...]:
+    """
+    Строит кадры прогресс-бара для каждого возможного числа заполненных ячеек.
+    
+    Args:
+        progress_text: Локализованная подпись прогресс-бара
+        width: Ширина прогресс-бара
+        use_colors: Использовать ли цветной вывод
+        
+    Returns:
+        Кортеж из width + 1 кадров, индексируемый числом заполненных ячеек
+    """
+    if use_colors:
+        return tuple(
+            f"\r{_CYAN}{progress_text}: {_RESET}"
+            f"{_GREEN}{'█' * filled}{_WHITE}{'░' * (width - filled)}"
+            for filled in range(width + 1)
+        )
+    return tuple(
+        f"\r{progress_text}: [{'=' * filled}{' ' * (width - filled)}]"
+        for filled in range(width + 1)
+    )
+
+
 @dataclass
 class DisplayConfig:
     """Конфигурация отображения для консольного интерфейса."""
@@ -50,6 +84,12 @@ class DisplayConfig:
     progress_width: int = DEFAULT_PROGRESS_WIDTH
     animation_speed: float = ANIMATION_DELAY
     language: Language = Language.RUSSIAN
+    auto_detect_tty: bool = True
+    
+    def __post_init__(self):
+        """Отключает анимацию, если вывод перенаправлен не в терминал."""
+        if self.auto_detect_tty and not sys.stdout.isatty():
+            self.use_animation = False
 
 
 class ConsoleUI:
@@ -68,9 +108,9 @@ class ConsoleUI:
         """Выводит красивый баннер приветствия."""
         welcome_text = get_text("welcome_banner")
         banner = f"""
-{Fore.CYAN if self.config.use_colors else ''}╔══════════════════════════════════════╗
+{_CYAN if self.config.use_colors else ''}╔══════════════════════════════════════╗
 ║     {welcome_text}     ║
-╚══════════════════════════════════════╝{Style.RESET_ALL if self.config.use_colors else ''}
+╚══════════════════════════════════════╝{_RESET if self.config.use_colors else ''}
 """
         print(banner)
     
@@ -84,8 +124,8 @@ class ConsoleUI:
             bright: Использовать ли яркий стиль
         """
         if self.config.use_colors:
-            style = Style.BRIGHT if bright else ''
-            print(f"{color}{style}{text}{Style.RESET_ALL}")
+            style = _BRIGHT if bright else ''
+            print(f"{color}{style}{text}{_RESET}")
         else:
             print(text)
     
@@ -100,12 +140,14 @@ class ConsoleUI:
         Returns:
             Введенная пользователем строка
         """
-        formatted_prompt = f"{color}{prompt}: {Style.RESET_ALL}" if self.config.use_colors else f"{prompt}: "
+        formatted_prompt = f"{color}{prompt}: {_RESET}" if self.config.use_colors else f"{prompt}: "
         return input(formatted_prompt)
     
     def show_progress(self, duration: float = 1.0, width: Optional[int] = None) -> None:
         """
         Показывает анимированный прогресс-бар.
+        Если анимация отключена (в том числе автоматически, когда вывод
+        перенаправлен не в терминал), выводится только итоговое состояние без задержки.
         
         Args:
             duration: Длительность анимации в секундах
@@ -114,23 +156,42 @@ class ConsoleUI:
         if width is None:
             width = self.config.progress_width
             
-        progress_text = get_text("progress")
+        frames = _progress_frames(get_text("progress"), width, self.config.use_colors)
+        line_end = f"{_RESET}\n" if self.config.use_colors else "\n"
+        
+        if not self.config.use_animation:
+            # Анимация отключена: выводим только итоговый кадр
+            sys.stdout.write(frames[width].lstrip('\r'))
+            sys.stdout.write(_PERCENT_LABELS[PROGRESS_STEPS])
+            sys.stdout.write(line_end)
+            return
+            
+        step_duration = duration / PROGRESS_STEPS
+        start = time.perf_counter()
+        last_step = -1
         
-        for i in range(PROGRESS_STEPS + 1):
-            filled = int(width * i / PROGRESS_STEPS)
-            if self.config.use_colors:
-                bar = f"{Fore.GREEN}{'█' * filled}{Fore.WHITE}{'░' * (width - filled)}"
-                percent = i * 100 // PROGRESS_STEPS
-                sys.stdout.write(f'\r{Fore.CYAN}{progress_text}: {Style.RESET_ALL}{bar} {percent}%')
+        # Кадры привязаны к монотонным часам: пропущенные шаги не рисуются,
+        # а общая длительность не зависит от накладных расходов на вывод
+        while True:
+            elapsed = time.perf_counter() - start
+            if step_duration > 0:
+                step = min(PROGRESS_STEPS, int(elapsed / step_duration))
             else:
-                bar = '=' * filled + ' ' * (width - filled)
-                percent = i * 100 // PROGRESS_STEPS
-                sys.stdout.write(f'\r{progress_text}: [{bar}] {percent}%')
+                step = PROGRESS_STEPS
+                
+            if step != last_step:
+                sys.stdout.write(frames[width * step // PROGRESS_STEPS])
+                sys.stdout.write(_PERCENT_LABELS[step])
+                sys.stdout.flush()
+                last_step = step
+                
+            if step == PROGRESS_STEPS:
+                break
                 
-            sys.stdout.flush()
-            time.sleep(duration / PROGRESS_STEPS)
+            time.sleep(max(0.0, (step + 1) * step_duration - (time.perf_counter() - start)))
             
-        print(Style.RESET_ALL if self.config.use_colors else '')
+        sys.stdout.write(line_end)
+        sys.stdout.flush()
     
     def list_items(self, items: List[Any], title: str = None) -> None:
         """
@@ -148,18 +209,25 @@ class ConsoleUI:
             return
             
         if self.config.use_colors:
-            print(f"\n{Fore.CYAN}╭─ {title} ─╮{Style.RESET_ALL}")
-            for item in items:
-                if self.config.use_animation:
-                    time.sleep(self.config.animation_speed)
-                print(f"{Fore.WHITE}│ • {Style.BRIGHT}{item}{Style.RESET_ALL}")
-            print(f"{Fore.CYAN}╰{'─' * (len(title) + 2)}╯{Style.RESET_ALL}")
+            header = f"\n{_CYAN}╭─ {title} ─╮{_RESET}"
+            lines = [f"{_WHITE}│ • {_BRIGHT}{item}{_RESET}" for item in items]
+            footer = [f"{_CYAN}╰{'─' * (len(title) + 2)}╯{_RESET}"]
         else:
-            print(f"{title}:")
-            for item in items:
-                if self.config.use_animation:
-                    time.sleep(self.config.animation_speed)
-                print(f"- {item}")
+            header = f"{title}:"
+            lines = [f"- {item}" for item in items]
+            footer = []
+            
+        if not self.config.use_animation:
+            # Без анимации выводим весь список одним вызовом
+            print("\n".join([header, *lines, *footer]))
+            return
+            
+        print(header)
+        for line in lines:
+            time.sleep(self.config.animation_speed)
+            print(line)
+        for line in footer:
+            print(line)
     
     def show_result(self, result: Any, prefix: str = None) -> None:
         """
@@ -173,7 +241,7 @@ class ConsoleUI:
             prefix = get_text("result_with_colon")
             
         if self.config.use_colors:
-            print(f"\n{Fore.GREEN}✨ {prefix} {Style.BRIGHT}{result}{Style.RESET_ALL}")
+            print(f"\n{_GREEN}✨ {prefix} {_BRIGHT}{result}{_RESET}")
         else:
             print(f"\n{prefix} {result}")
     
@@ -185,7 +253,7 @@ class ConsoleUI:
             operation: Описание операции
         """
         if self.config.use_colors:
-            print(f"\n{Fore.YELLOW}{operation}{Style.RESET_ALL}")
+            print(f"\n{_YELLOW}{operation}{_RESET}")
         else:
             print(f"\n{operation}")
 
@@ -226,64 +294,100 @@ class Calculator:
         return a + b
 
 
-def input_with_timeout(prompt: str, timeout: float = INPUT_TIMEOUT, default: str = None) -> str:
+def _stdin_ready(stream: TextIO, timeout: float) -> bool:
+    """
+    Ожидает появления ввода в потоке не дольше указанного времени.
+    
+    В POSIX используется select() для потока. В Windows select() работает только
+    с сокетами, поэтому консоль опрашивается через msvcrt.kbhit(), а
+    перенаправленный ввод (канал, файл) считается готовым сразу.
+    
+    Args:
+        stream: Поток ввода (обычно sys.stdin)
+        timeout: Время ожидания в секундах
+        
+    Returns:
+        True, если ввод доступен для чтения, иначе False
+    """
+    if os.name == "nt":
+        if not stream.isatty():
+            return True
+        import msvcrt
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if msvcrt.kbhit():
+                return True
+            time.sleep(INPUT_POLL_INTERVAL)
+        return False
+        
+    ready, _, _ = select.select([stream], [], [], timeout)
+    return bool(ready)
+
+
+def _read_line(stream: TextIO) -> str:
+    """
+    Читает одну строку из потока без символа перевода строки.
+    
+    В POSIX строка читается побайтно напрямую из файлового дескриптора, чтобы
+    в буфере потока не оставалось данных, которых не видит select().
+    
+    Args:
+        stream: Поток ввода (обычно sys.stdin)
+        
+    Returns:
+        Прочитанная строка (пустая при конце ввода)
+    """
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        fd = None
+        
+    if os.name == "nt" or fd is None:
+        return stream.readline().rstrip('\n\r')
+        
+    chunks = []
+    while True:
+        byte = os.read(fd, 1)
+        if not byte or byte == b"\n":
+            break
+        chunks.append(byte)
+    return b"".join(chunks).decode(stream.encoding or "utf-8", errors="replace").rstrip('\r')
+
+
+def input_with_timeout(prompt: str, timeout: float = INPUT_TIMEOUT, default: str = None, *,
+                       _stdin: Optional[TextIO] = None,
+                       _ready: Callable[[TextIO, float], bool] = _stdin_ready) -> str:
     """
-    Запрашивает ввод с таймаутом. Если пользователь не начинает вводить в течение указанного времени,
+    Запрашивает ввод с таймаутом. Если пользователь не вводит данные в течение указанного времени,
     возвращает значение по умолчанию.
     
     Args:
         prompt: Приглашение к вводу
         timeout: Время ожидания в секундах
         default: Значение по умолчанию
+        _stdin: Поток ввода (по умолчанию sys.stdin), используется в тестах
+        _ready: Функция ожидания ввода, используется в тестах
         
     Returns:
         Введенная строка или значение по умолчанию
     """
-    result_queue = queue.Queue()
-    input_started = threading.Event()
-    
-    def input_thread():
-        """Поток для ввода данных."""
-        try:
-            # Показываем приглашение
-            sys.stdout.write(prompt)
-            sys.stdout.flush()
-            
-            # Ждем первый символ
-            first_char = sys.stdin.read(1)
-            if first_char:
-                input_started.set()  # Сигнализируем, что ввод начался
-                
-                # Читаем остальную часть строки
-                rest_of_line = sys.stdin.readline()
-                full_input = first_char + rest_of_line.rstrip('\n\r')
-                result_queue.put(full_input)
-            else:
-                result_queue.put("")
-        except Exception as e:
-            result_queue.put("")
-    
-    # Запускаем поток ввода
-    thread = threading.Thread(target=input_thread, daemon=True)
-    thread.start()
-    
-    # Ждем либо начала ввода, либо таймаута
-    if input_started.wait(timeout):
-        # Пользователь начал вводить, ждем завершения
-        thread.join()
-        try:
-            return result_queue.get_nowait()
-        except queue.Empty:
-            return default
-    else:
-        # Таймаут истек
-        if default == "1" and "[1]" in prompt:
-            # Это выбор языка
-            print(f"\n{get_text('timeout_message')} {get_text('using_default_language')}")
-        elif default and default != "1":
-            # Это имя пользователя
-            print(f"\n{get_text('timeout_message')} {get_text('using_default_name').format(name=default)}")
-        return default
+    stdin = sys.stdin if _stdin is None else _stdin
+    
+    # Показываем приглашение
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    
+    if _ready(stdin, timeout):
+        return _read_line(stdin)
+        
+    # Таймаут истек
+    if default == "1" and "[1]" in prompt:
+        # Это выбор языка
+        print(f"\n{get_text('timeout_message')} {get_text('using_default_language')}")
+    elif default and default != "1":
+        # Это имя пользователя
+        print(f"\n{get_text('timeout_message')} {get_text('using_default_name').format(name=default)}")
+    return default
 
 
 def safe_input(prompt_func: Callable[[], str], 
@@ -310,7 +414,7 @@ def safe_input(prompt_func: Callable[[], str],
         print(error_message)
 
 
-def greet_user(ui: ConsoleUI) -> str:
+def greet_user(ui: ConsoleUI, *, _input: Callable[..., str] = input_with_timeout) -> str:
     """
     Запрашивает имя пользователя и здоровается с ним.
     Если пользователь не начинает вводить имя в течение 10 секунд,
@@ -318,6 +422,7 @@ def greet_user(ui: ConsoleUI) -> str:
     
     Args:
         ui: Объект пользовательского интерфейса
+        _input: Функция ввода с таймаутом, используется в тестах
         
     Returns:
         Имя пользователя
@@ -331,12 +436,12 @@ def greet_user(ui: ConsoleUI) -> str:
     
     # Формируем цветное приглашение
     if ui.config.use_colors:
-        formatted_prompt = f"{Fore.CYAN}{enter_name_prompt}: {Style.RESET_ALL}"
+        formatted_prompt = f"{_CYAN}{enter_name_prompt}: {_RESET}"
     else:
         formatted_prompt = f"{enter_name_prompt}: "
     
     # Запрашиваем ввод с таймаутом
-    name = input_with_timeout(formatted_prompt, INPUT_TIMEOUT, default_username)
+    name = _input(formatted_prompt, INPUT_TIMEOUT, default_username)
     
     # Если имя пустое, используем значение по умолчанию
     if not name.strip():
@@ -349,12 +454,15 @@ def greet_user(ui: ConsoleUI) -> str:
     return name
 
 
-def select_language() -> Language:
+def select_language(*, _input: Callable[..., str] = input_with_timeout) -> Language:
     """
     Запрашивает у пользователя выбор языка с таймаутом.
     Если пользователь не выбирает язык в течение 10 секунд, 
     используется русский язык по умолчанию.
     
+    Args:
+        _input: Функция ввода с таймаутом, используется в тестах
+    
     Returns:
         Выбранный язык
     """
@@ -366,7 +474,7 @@ def select_language() -> Language:
     prompt = f"{get_text('language_prompt')} [1]: "
     
     while True:
-        choice = input_with_timeout(prompt, INPUT_TIMEOUT, "1")
+        choice = _input(prompt, INPUT_TIMEOUT, "1")
         
         if choice == "1" or choice.strip() == "":
             return Language.RUSSIAN
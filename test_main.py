@@ -1,29 +1,124 @@
+import os
+import builtins
+import contextlib
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from io import StringIO
+from types import SimpleNamespace
 import sys
 
+from colorama import Fore, Style
+
 from main import (
-    ConsoleUI, DisplayConfig, Calculator, 
+    PROGRESS_STEPS, ConsoleUI, _progress_frames, DisplayConfig, Calculator, 
     safe_input, greet_user, input_with_timeout, 
     get_default_username, select_language
 )
-from localization import Language, set_language
+import localization
+from localization import Language, Localizer, set_language, localizer
+
+
+# Ожидаемый вывод list_items без цветов и анимации
+_EXPECTED_FRUITS = ("Элементы в списке:", "- яблоко", "- банан", "- вишня")
+_EXPECTED_NUMBERS = ("Элементы в списке:", "- 1", "- 2", "- 3")
+
+
+@contextlib.contextmanager
+def _capture_prints():
+    """Подменяет print, собирая текст каждого вызова отдельным элементом списка."""
+    outputs = []
+    original_print = builtins.print
+    builtins.print = lambda *args, **kwargs: outputs.append(' '.join(map(str, args)))
+    try:
+        yield outputs
+    finally:
+        builtins.print = original_print
+
+
+def _fake_input(value):
+    """Возвращает функцию ввода, которая всегда отвечает value и запоминает приглашения."""
+    prompts = []
+    
+    def fake_input(prompt, timeout=None, default=None):
+        prompts.append(prompt)
+        return value
+    
+    fake_input.prompts = prompts
+    return fake_input
+
+
+class _FakeUI:
+    """Легковесная замена ConsoleUI, подсчитывающая вызовы методов вывода."""
+    
+    def __init__(self):
+        self.config = SimpleNamespace(use_colors=False, use_animation=False)
+        self.show_operation_calls = 0
+        self.print_colored_calls = 0
+        self.get_user_input_calls = 0
+    
+    def show_operation(self, operation):
+        self.show_operation_calls += 1
+    
+    def print_colored(self, text, color=None, bright=False):
+        self.print_colored_calls += 1
+    
+    def get_user_input(self, prompt, color=None):
+        self.get_user_input_calls += 1
+        return ""
+
+
+class _TtyStringIO(StringIO):
+    """StringIO, который выдает себя за интерактивный терминал."""
+    
+    def isatty(self):
+        return True
+
+
+class _FakeClock:
+    """Часы для тестов: время идет только во время sleep, плюс задержка вывода lag."""
+    
+    def __init__(self, lag=0.0):
+        self.now = 0.0
+        self.lag = lag
+        self.sleeps = []
+    
+    def perf_counter(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds + self.lag
+
+
+class TestDisplayConfig(unittest.TestCase):
+    """Тесты для класса DisplayConfig."""
+    
+    def test_animation_disabled_when_redirected(self):
+        """Тест отключения анимации при выводе не в терминал."""
+        with patch('sys.stdout', new_callable=StringIO):
+            self.assertFalse(DisplayConfig().use_animation)
+            self.assertTrue(DisplayConfig(auto_detect_tty=False).use_animation)
 
 
 class TestConsoleUI(unittest.TestCase):
     """Тесты для класса ConsoleUI."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Настройка, общая для всех тестов класса (ConsoleUI не хранит состояния)."""
+        cls.config = DisplayConfig(use_colors=False, use_animation=False)
+        cls.ui = ConsoleUI(cls.config)
+    
     def setUp(self):
-        """Настройка для каждого теста."""
-        self.config = DisplayConfig(use_colors=False, use_animation=False)
-        self.ui = ConsoleUI(self.config)
+        """Перехватывает print, сохраняя текст каждого вызова в self.outputs."""
+        capture = _capture_prints()
+        self.outputs = capture.__enter__()
+        self.addCleanup(capture.__exit__, None, None, None)
     
     def test_print_colored(self):
         """Тест метода print_colored."""
-        with patch('builtins.print') as mock_print:
-            self.ui.print_colored("Test message")
-            mock_print.assert_called_once_with("Test message")
+        self.ui.print_colored("Test message")
+        self.assertEqual(self.outputs, ["Test message"])
     
     def test_get_user_input(self):
         """Тест метода get_user_input."""
@@ -32,51 +127,76 @@ class TestConsoleUI(unittest.TestCase):
             mock_input.assert_called_once_with("Enter: ")
             self.assertEqual(result, "Test input")
     
+    def test_show_progress_redirected_output(self):
+        """Тест метода show_progress при выводе не в терминал."""
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            ui = ConsoleUI(DisplayConfig(use_colors=False, use_animation=True))
+            with patch('time.sleep') as mock_sleep:
+                ui.show_progress(10, width=5)
+                mock_sleep.assert_not_called()
+            self.assertEqual(mock_stdout.getvalue(), "Прогресс: [=====] 100%\n")
+    
+    def test_show_progress_animation_forced(self):
+        """Тест show_progress с отключенным автоопределением терминала."""
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            config = DisplayConfig(use_colors=False, use_animation=True, auto_detect_tty=False)
+            ConsoleUI(config).show_progress(0, width=5)
+            self.assertEqual(mock_stdout.getvalue(), "\rПрогресс: [=====] 100%\n")
+    
+    def test_progress_frames_colored(self):
+        """Тест цветных кадров прогресс-бара."""
+        expected = tuple(
+            f'\r{Fore.CYAN}X: {Style.RESET_ALL}'
+            f"{Fore.GREEN}{'█' * filled}{Fore.WHITE}{'░' * (2 - filled)}"
+            for filled in range(3)
+        )
+        self.assertEqual(_progress_frames("X", 2, True), expected)
+    
+    def _animate_progress(self, duration, clock):
+        """Запускает анимированный show_progress в «терминал» с подмененными часами."""
+        config = DisplayConfig(use_colors=False, use_animation=True, auto_detect_tty=False)
+        with patch('sys.stdout', new_callable=_TtyStringIO) as mock_stdout:
+            with patch('time.perf_counter', clock.perf_counter), patch('time.sleep', clock.sleep):
+                ConsoleUI(config).show_progress(duration, width=5)
+        return mock_stdout.getvalue()
+    
+    def test_show_progress_coalesces_frames(self):
+        """Тест пропуска кадров show_progress при медленном выводе."""
+        clock = _FakeClock(lag=0.05)
+        output = self._animate_progress(1.0, clock)
+        frames = output.split("\r")[1:]
+        percents = [int(frame.rstrip("%\n").rsplit(" ", 1)[1]) for frame in frames]
+        
+        self.assertGreater(len(frames), 1)
+        self.assertLess(len(frames), PROGRESS_STEPS + 1)
+        self.assertEqual(percents, sorted(set(percents)))
+        self.assertEqual(frames[-1], "Прогресс: [=====] 100%\n")
+        self.assertEqual(output.count("\n"), 1)
+        self.assertGreaterEqual(clock.now, 1.0)
+    
+    def test_show_progress_zero_duration(self):
+        """Тест show_progress с нулевой длительностью."""
+        clock = _FakeClock()
+        output = self._animate_progress(0, clock)
+        self.assertEqual(output, "\rПрогресс: [=====] 100%\n")
+        self.assertEqual(clock.sleeps, [])
+    
     def test_list_items_empty(self):
         """Тест метода list_items с пустым списком."""
-        with patch('builtins.print') as mock_print:
-            self.ui.list_items([])
-            mock_print.assert_called_once()
+        self.ui.list_items([])
+        self.assertEqual(self.outputs, ["Элементы в списке:"])
     
     def test_list_items(self):
         """Тест метода list_items со списком элементов."""
-        with patch('builtins.print') as mock_print:
-            # Настраиваем mock для захвата вывода
-            outputs = []
-            mock_print.side_effect = lambda *args: outputs.append(' '.join(map(str, args)))
-            
-            self.ui.list_items(['яблоко', 'банан', 'вишня'])
-            
-            expected_output = [
-                "Элементы в списке:",
-                "- яблоко",
-                "- банан",
-                "- вишня"
-            ]
-            
-            # Проверяем, что вывод соответствует ожидаемому
-            self.assertEqual(len(outputs), len(expected_output))
-            for actual, expected in zip(outputs, expected_output):
-                self.assertEqual(actual, expected)
+        self.ui.list_items(['яблоко', 'банан', 'вишня'])
+        
+        # Без анимации весь список выводится одним вызовом print
+        self.assertEqual(self.outputs, ["\n".join(_EXPECTED_FRUITS)])
     
     def test_list_items_with_numbers(self):
         """Тест метода list_items со списком чисел."""
-        with patch('builtins.print') as mock_print:
-            outputs = []
-            mock_print.side_effect = lambda *args: outputs.append(' '.join(map(str, args)))
-            
-            self.ui.list_items([1, 2, 3])
-            
-            expected_output = [
-                "Элементы в списке:",
-                "- 1",
-                "- 2",
-                "- 3"
-            ]
-            
-            self.assertEqual(len(outputs), len(expected_output))
-            for actual, expected in zip(outputs, expected_output):
-                self.assertEqual(actual, expected)
+        self.ui.list_items([1, 2, 3])
+        self.assertEqual(self.outputs, ["\n".join(_EXPECTED_NUMBERS)])
 
 
 class TestCalculator(unittest.TestCase):
@@ -84,22 +204,24 @@ class TestCalculator(unittest.TestCase):
     
     def setUp(self):
         """Настройка для каждого теста."""
-        self.ui = MagicMock()
+        self.ui = _FakeUI()
         self.calculator = Calculator(self.ui)
     
     def test_add(self):
         """Тест метода add."""
-        # Тест с положительными числами
-        self.assertEqual(self.calculator.add(5, 3, False), 8)
-        
-        # Тест с отрицательными числами
-        self.assertEqual(self.calculator.add(-1, 1, False), 0)
-        
-        # Тест с нулями
-        self.assertEqual(self.calculator.add(0, 0, False), 0)
-        
-        # Проверяем, что метод show_operation был вызван
-        self.ui.show_operation.assert_called()
+        cases = [
+            (5, 3, 8),    # Положительные числа
+            (-1, 1, 0),   # Отрицательные числа
+            (0, 0, 0),    # Нули
+        ]
+        for a, b, expected in cases:
+            with self.subTest(a=a, b=b):
+                self.assertEqual(self.calculator.add(a, b, False), expected)
+    
+    def test_add_shows_operation(self):
+        """Тест вывода операции методом add."""
+        self.calculator.add(5, 3, False)
+        self.assertEqual(self.ui.show_operation_calls, 1)
 
 
 class TestHelperFunctions(unittest.TestCase):
@@ -117,116 +239,157 @@ class TestHelperFunctions(unittest.TestCase):
     
     def test_safe_input_invalid_then_valid(self):
         """Тест функции safe_input с невалидным, а затем валидным вводом."""
-        with patch('builtins.input', side_effect=["invalid", "valid"]):
-            with patch('builtins.print') as mock_print:
-                result = safe_input(
-                    lambda: input("Test: "),
-                    lambda x: x == "valid",
-                    "Error"
-                )
-                mock_print.assert_called_once_with("Error")
-                self.assertEqual(result, "valid")
+        inputs = iter(["invalid", "valid"])
+        with _capture_prints() as outputs:
+            result = safe_input(
+                inputs.__next__,
+                lambda x: x == "valid",
+                "Error"
+            )
+        self.assertEqual(outputs, ["Error"])
+        self.assertEqual(result, "valid")
     
     def test_greet_user(self):
         """Тест функции greet_user."""
-        mock_ui = MagicMock()
-        mock_ui.config.use_colors = False
+        fake_ui = _FakeUI()
+        
+        fake_input = _fake_input("Test User")
         
-        with patch('main.input_with_timeout', return_value="Test User") as mock_input_timeout:
-            result = greet_user(mock_ui)
-            self.assertEqual(result, "Test User")
-            mock_ui.print_colored.assert_called()
-            mock_input_timeout.assert_called_once()
+        result = greet_user(fake_ui, _input=fake_input)
+        self.assertEqual(result, "Test User")
+        self.assertGreater(fake_ui.print_colored_calls, 0)
+        self.assertEqual(len(fake_input.prompts), 1)
     
     def test_greet_user_timeout(self):
         """Тест функции greet_user с таймаутом (использование имени по умолчанию)."""
-        mock_ui = MagicMock()
-        mock_ui.config.use_colors = False
+        fake_ui = _FakeUI()
         
-        with patch('main.input_with_timeout', return_value="Пользователь") as mock_input_timeout:
-            result = greet_user(mock_ui)
-            self.assertEqual(result, "Пользователь")
-            mock_ui.print_colored.assert_called()
-            mock_input_timeout.assert_called_once()
+        fake_input = _fake_input("Пользователь")
+        
+        result = greet_user(fake_ui, _input=fake_input)
+        self.assertEqual(result, "Пользователь")
+        self.assertGreater(fake_ui.print_colored_calls, 0)
+        self.assertEqual(len(fake_input.prompts), 1)
+
+
+class TestLocalization(unittest.TestCase):
+    """Тесты для модуля локализации."""
+    
+    def test_missing_key_falls_back_to_russian(self):
+        """Тест подстановки русского текста для ключа, отсутствующего в английской таблице."""
+        english = dict(localization._TABLES["en"])
+        del english["hello"]
+        self.addCleanup(localization._lookup.cache_clear)
+        
+        with patch.dict(localization._TABLES, {"en": english}):
+            localization._lookup.cache_clear()
+            self.assertEqual(Localizer(Language.ENGLISH).get_text("hello"), "Привет")
+    
+    def test_missing_key_placeholder(self):
+        """Тест заглушки для ключа, отсутствующего во всех таблицах."""
+        english = Localizer(Language.ENGLISH)
+        self.assertEqual(english.get_text("no_such_key"), "[Missing translation: no_such_key]")
+        self.assertEqual(english.get_list("no_such_key"), [])
+
+
+    def test_set_language_same_language_is_noop(self):
+        """Тест повторной установки текущего языка и переключения на другой."""
+        self.addCleanup(set_language, localizer.language)
+        current = localizer.language
+        other = Language.ENGLISH if current is Language.RUSSIAN else Language.RUSSIAN
+        
+        with patch.object(localizer, 'set_language', wraps=localizer.set_language) as mock_set:
+            set_language(current)
+            mock_set.assert_not_called()
+            
+            set_language(other)
+            mock_set.assert_called_once_with(other)
+        self.assertIs(localizer.language, other)
 
 
 class TestNewFunctions(unittest.TestCase):
     """Тесты для новых функций с таймаутом."""
     
-    def test_get_default_username_russian(self):
-        """Тест функции get_default_username для русского языка."""
+    @classmethod
+    def setUpClass(cls):
+        """Один раз устанавливает русский язык для всех тестов класса."""
+        cls.original_language = localizer.language
         set_language(Language.RUSSIAN)
-        result = get_default_username()
-        self.assertEqual(result, "Пользователь")
     
-    def test_get_default_username_english(self):
-        """Тест функции get_default_username для английского языка."""
-        set_language(Language.ENGLISH)
-        result = get_default_username()
-        self.assertEqual(result, "User")
+    @classmethod
+    def tearDownClass(cls):
+        """Восстанавливает язык, действовавший до запуска тестов класса."""
+        set_language(cls.original_language)
+    
+    def test_get_default_username(self):
+        """Тест функции get_default_username для каждого языка."""
+        self.addCleanup(set_language, Language.RUSSIAN)
+        cases = [
+            (Language.RUSSIAN, "Пользователь"),
+            (Language.ENGLISH, "User"),
+        ]
+        for language, expected in cases:
+            with self.subTest(language=language):
+                set_language(language)
+                self.assertEqual(get_default_username(), expected)
     
     def test_input_with_timeout_immediate_input(self):
         """Тест функции input_with_timeout с немедленным вводом."""
-        with patch('threading.Thread') as mock_thread:
-            with patch('queue.Queue') as mock_queue:
-                with patch('threading.Event') as mock_event:
-                    # Настраиваем mock для имитации немедленного ввода
-                    mock_event_instance = MagicMock()
-                    mock_event_instance.wait.return_value = True
-                    mock_event.return_value = mock_event_instance
-                    
-                    mock_queue_instance = MagicMock()
-                    mock_queue_instance.get_nowait.return_value = "test input"
-                    mock_queue.return_value = mock_queue_instance
-                    
-                    result = input_with_timeout("Test: ", 1, "default")
-                    self.assertEqual(result, "test input")
+        result = input_with_timeout("", 1, "default",
+                                    _stdin=_TtyStringIO("test input\n"),
+                                    _ready=lambda stream, timeout: True)
+        self.assertEqual(result, "test input")
+    
+    def test_input_with_timeout_windows_redirected_input(self):
+        """Тест функции input_with_timeout с перенаправленным вводом в Windows."""
+        stdin = StringIO("2\nAnn\n")
+        with patch('os.name', 'nt'):
+            self.assertEqual(input_with_timeout("", 10, "1", _stdin=stdin), "2")
+            self.assertEqual(input_with_timeout("", 10, "default", _stdin=stdin), "Ann")
+    
+    @unittest.skipIf(os.name == "nt", "в Windows перенаправленный ввод читается без таймаута")
+    def test_input_with_timeout_empty_pipe(self):
+        """Тест функции input_with_timeout с открытым каналом без данных."""
+        read_fd, write_fd = os.pipe()
+        self.addCleanup(os.close, write_fd)
+        with open(read_fd) as stdin, _capture_prints():
+            result = input_with_timeout("", 0.1, "default", _stdin=stdin)
+        self.assertEqual(result, "default")
+    
+    def test_input_with_timeout_pipe_lines(self):
+        """Тест функции input_with_timeout с несколькими строками в открытом канале."""
+        read_fd, write_fd = os.pipe()
+        self.addCleanup(os.close, write_fd)
+        os.write(write_fd, "first\nвторая\n".encode("utf-8"))
+        with open(read_fd, encoding="utf-8") as stdin:
+            self.assertEqual(input_with_timeout("", 1, "default", _stdin=stdin), "first")
+            self.assertEqual(input_with_timeout("", 1, "default", _stdin=stdin), "вторая")
     
     def test_input_with_timeout_timeout(self):
         """Тест функции input_with_timeout с таймаутом."""
-        with patch('threading.Thread') as mock_thread:
-            with patch('queue.Queue') as mock_queue:
-                with patch('threading.Event') as mock_event:
-                    with patch('builtins.print') as mock_print:
-                        # Настраиваем mock для имитации таймаута
-                        mock_event_instance = MagicMock()
-                        mock_event_instance.wait.return_value = False
-                        mock_event.return_value = mock_event_instance
-                        
-                        result = input_with_timeout("Test: ", 0.1, "default_value")
-                        self.assertEqual(result, "default_value")
-    
-    def test_select_language_russian(self):
-        """Тест функции select_language с выбором русского языка."""
-        with patch('main.input_with_timeout', return_value="1") as mock_input:
-            with patch('builtins.print'):
-                result = select_language()
-                self.assertEqual(result, Language.RUSSIAN)
-                mock_input.assert_called_once()
-    
-    def test_select_language_english(self):
-        """Тест функции select_language с выбором английского языка."""
-        with patch('main.input_with_timeout', return_value="2") as mock_input:
-            with patch('builtins.print'):
-                result = select_language()
-                self.assertEqual(result, Language.ENGLISH)
-                mock_input.assert_called_once()
-    
-    def test_select_language_timeout(self):
-        """Тест функции select_language с таймаутом (русский по умолчанию)."""
-        with patch('main.input_with_timeout', return_value="1") as mock_input:
-            with patch('builtins.print'):
-                result = select_language()
-                self.assertEqual(result, Language.RUSSIAN)
-                mock_input.assert_called_once()
-    
-    def test_select_language_empty_input(self):
-        """Тест функции select_language с пустым вводом."""
-        with patch('main.input_with_timeout', return_value="") as mock_input:
-            with patch('builtins.print'):
-                result = select_language()
-                self.assertEqual(result, Language.RUSSIAN)
-                mock_input.assert_called_once()
+        stdin = _TtyStringIO("unread\n")
+        with _capture_prints() as outputs:
+            result = input_with_timeout("", 0.1, "default_value",
+                                        _stdin=stdin,
+                                        _ready=lambda stream, timeout: False)
+        self.assertEqual(result, "default_value")
+        self.assertEqual(outputs, ["\nВремя ожидания истекло. Используем имя по умолчанию: default_value"])
+        self.assertEqual(stdin.tell(), 0)
+    
+    def test_select_language(self):
+        """Тест функции select_language для разных вариантов ввода."""
+        cases = [
+            ("1", Language.RUSSIAN),  # Выбор русского языка (и таймаут)
+            ("2", Language.ENGLISH),  # Выбор английского языка
+            ("", Language.RUSSIAN),   # Пустой ввод
+        ]
+        for user_input, expected in cases:
+            with self.subTest(user_input=user_input):
+                fake_input = _fake_input(user_input)
+                with _capture_prints():
+                    result = select_language(_input=fake_input)
+                self.assertEqual(result, expected)
+                self.assertEqual(len(fake_input.prompts), 1)
 
 
 if __name__ == '__main__':